@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
@@ -17,15 +19,49 @@ class Settings(BaseSettings):
     db_user: str = Field("postgres", env="DB_USER")
     db_password: str = Field("postgres", env="DB_PASSWORD")
 
+    # Connection pool (persistent connections + burst overflow per process)
+    db_pool_size: int = Field(20, env="DB_POOL_SIZE")
+    db_max_overflow: int = Field(20, env="DB_MAX_OVERFLOW")
+    db_pool_recycle_seconds: int = Field(1800, env="DB_POOL_RECYCLE_SECONDS")
+    # Prepared statements kept per pooled connection (0 disables, e.g. behind
+    # PgBouncer in transaction mode)
+    db_statement_cache_size: int = Field(1024, env="DB_STATEMENT_CACHE_SIZE")
+
     # ── OpenAI ──────────────────────────────────────────────────────────────
     openai_api_key: str = Field(..., env="OPENAI_API_KEY")
     openai_model: str = Field("gpt-4o-mini", env="OPENAI_MODEL")
     # Optional: override to use a custom / proxy OpenAI-compatible base URL.
     # Leave unset (or empty string) to use the official OpenAI endpoint.
     openai_base_url: str | None = Field(None, env="OPENAI_BASE_URL")
+    # Per-request timeout for the shared OpenAI HTTP client (seconds)
+    openai_timeout_seconds: float = Field(30.0, env="OPENAI_TIMEOUT_SECONDS")
+    # Ask for schema-constrained JSON (response_format=json_schema) on lead
+    # enrichment. Disable for models/providers without structured outputs;
+    # the prompt-only JSON path is used instead.
+    openai_structured_outputs: bool = Field(True, env="OPENAI_STRUCTURED_OUTPUTS")
+    # Mark the enrichment system prompt with cache_control (ephemeral) for
+    # endpoints that use explicit prompt-cache markers (Anthropic-style).
+    openai_prompt_cache_control: bool = Field(False, env="OPENAI_PROMPT_CACHE_CONTROL")
+
+    # ── Redis (optional) ────────────────────────────────────────────────────
+    # When set, /enrich-lead checks Redis for cached results and in-flight
+    # duplicates before touching Postgres. Example: redis://localhost:6379/0
+    redis_url: str | None = Field(None, env="REDIS_URL")
+
+    # ── LLM response cache ──────────────────────────────────────────────────
+    # memory (per process) | redis (shared, needs REDIS_URL) | none
+    llm_cache_backend: str = Field("memory", env="LLM_CACHE_BACKEND")
+    llm_cache_ttl_seconds: int = Field(3600, env="LLM_CACHE_TTL_SECONDS")
+    llm_cache_max_entries: int = Field(10000, env="LLM_CACHE_MAX_ENTRIES")
+    # GET /runs/{id} response cache per process (seconds; 0 disables). Opt-in:
+    # with several workers another worker's copy can be stale up to the TTL.
+    run_cache_ttl_seconds: int = Field(0, env="RUN_CACHE_TTL_SECONDS")
 
     # ── App ─────────────────────────────────────────────────────────────────
     log_level: str = Field("INFO", env="LOG_LEVEL")
+    # Run Base.metadata.create_all on startup (development only; production
+    # uses the SQL files in migrations/). Also on when LOG_LEVEL=DEBUG.
+    auto_create_schema: bool = Field(False, env="AUTO_CREATE_SCHEMA")
     # Maximum JSON payload size accepted by /enrich-lead (bytes). Default 64 KB.
     max_payload_bytes: int = Field(65536, env="MAX_PAYLOAD_BYTES")
     # Optional rate limiting for POST /opportunities and POST /opportunities/:id/analyze.
@@ -40,4 +76,10 @@ class Settings(BaseSettings):
     )
 
 
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings (the .env file is parsed once)."""
+    return Settings()
+
+
+settings = get_settings()
\ No newline at end of file
@@ -4,10 +4,12 @@ from typing import Any, Optional
 
 from sqlalchemy import func, or_, select, update
 from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.db.company_profile_repository import get_company_profile_dict
 from api.db.models import Lead, Run
+from api.db.repository import RUN_COLUMNS
 from api.services.icp_scoring import compute_icp_score
 
 
@@ -218,14 +220,14 @@ async def list_runs_for_lead(
     lead_id: str,
     limit: int = 50,
     offset: int = 0,
-) -> list[Run]:
+) -> list[Row]:
     stmt = (
-        select(Run)
+        select(*RUN_COLUMNS)
         .where(Run.lead_id == lead_id)
         .order_by(Run.created_at.desc())
         .limit(limit)
         .offset(offset)
     )
     rows = await session.execute(stmt)
-    return list(rows.scalars().all())
+    return list(rows.all())
 
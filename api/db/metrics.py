@@ -26,11 +26,7 @@ async def get_runs_summary(session: AsyncSession) -> dict[str, Any]:
     qualified_count = await session.scalar(
         select(func.count())
         .select_from(Run)
-        .where(
-            Run.status == "success",
-            Run.result_json.isnot(None),
-            Run.result_json["qualified"].astext == "true",
-        )
+        .where(Run.status == "success", Run.qualified.is_(True))
     )
     qualified = int(qualified_count or 0)
 
@@ -46,7 +42,8 @@ async def get_runs_summary(session: AsyncSession) -> dict[str, Any]:
     today_calls = await session.scalar(
         select(func.count())
         .select_from(Run)
-        .where(func.date(Run.created_at) == func.current_date())
+        # Bare created_at comparison (not date(created_at)) so the index applies
+        .where(Run.created_at >= func.current_date())
     )
 
     return {
@@ -70,9 +67,7 @@ async def get_source_breakdown(session: AsyncSession) -> list[dict[str, Any]]:
             func.sum(
                 case(
                     (
-                        (Run.status == "success")
-                        & (Run.result_json.isnot(None))
-                        & (Run.result_json["qualified"].astext == "true"),
+                        (Run.status == "success") & Run.qualified.is_(True),
                         1,
                     ),
                     else_=0,
@@ -4,10 +4,10 @@ Database models for runs and idempotency.
 Schema matches requirements exactly.
 """
 
+import uuid
 from datetime import date, datetime
-from uuid import uuid4
 
-from sqlalchemy import Date, DateTime, Float, ForeignKey, Integer, Numeric, String, Text, text
+from sqlalchemy import DDL, Boolean, Computed, Date, DateTime, Float, ForeignKey, Index, Integer, Numeric, String, Text, event, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -16,6 +16,34 @@ class Base(DeclarativeBase):
     pass
 
 
+# Time-ordered UUIDv7 generator (RFC 9562) used for runs.id, so new rows land
+# on the rightmost btree page instead of random ones. Mirrors
+# migrations/007_runs_uuid_v7.sql for databases created via create_all.
+GEN_UUID_V7_SQL = """
+CREATE OR REPLACE FUNCTION gen_uuid_v7() RETURNS uuid AS $$
+DECLARE
+    ts_ms bytea := substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3);
+    uuid_bytes bytea := uuid_send(gen_random_uuid());
+BEGIN
+    uuid_bytes := overlay(uuid_bytes PLACING ts_ms FROM 1 FOR 6);
+    uuid_bytes := set_byte(uuid_bytes, 6, (b'0111' || get_byte(uuid_bytes, 6)::bit(4))::bit(8)::int);
+    RETURN encode(uuid_bytes, 'hex')::uuid;
+END
+$$ LANGUAGE plpgsql VOLATILE
+"""
+
+event.listen(Base.metadata, "before_create", DDL(GEN_UUID_V7_SQL))
+# Trigram ops for the ILIKE '%...%' run search indexes.
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+# NULL unless result_json.qualified is a real JSON boolean, so manual edits with
+# odd values never make the generated column (and the write) fail.
+RUN_QUALIFIED_SQL = (
+    "CASE WHEN jsonb_typeof(result_json -> 'qualified') = 'boolean' "
+    "THEN (result_json -> 'qualified')::boolean END"
+)
+
+
 class Lead(Base):
     """
     Lead entity (lead-centric view).
@@ -29,7 +57,7 @@ class Lead(Base):
     id: Mapped[str] = mapped_column(
         UUID(as_uuid=False),
         primary_key=True,
-        default=lambda: str(uuid4()),
+        server_default=text("gen_random_uuid()"),
     )
 
     # Deterministic key when email/phone exists; used for upsert and linking runs.
@@ -73,17 +101,44 @@ class Run(Base):
     """Run history for full audit trail."""
 
     __tablename__ = "runs"
+    __table_args__ = (
+        # Serves the idempotency lookup: latest successful run for a key.
+        Index(
+            "idx_runs_idempotency_success",
+            "idempotency_key",
+            text("created_at DESC"),
+            postgresql_where=text("status = 'success'"),
+        ),
+        # Matches the list sort (created_at DESC, id DESC) and keyset cursor.
+        Index("idx_runs_created_id", text("created_at DESC"), text("id DESC")),
+        Index("idx_runs_status_created", "status", "created_at"),
+        Index("idx_runs_qualified_created", "qualified", "created_at"),
+        # Trigram indexes so source/error/id substring search avoids seq scans.
+        Index(
+            "idx_runs_source_trgm",
+            "source",
+            postgresql_using="gin",
+            postgresql_ops={"source": "gin_trgm_ops"},
+        ),
+        Index(
+            "idx_runs_error_trgm",
+            "error",
+            postgresql_using="gin",
+            postgresql_ops={"error": "gin_trgm_ops"},
+        ),
+        Index("idx_runs_id_trgm", text("(id::text) gin_trgm_ops"), postgresql_using="gin"),
+    )
 
-    id: Mapped[str] = mapped_column(
-        UUID(as_uuid=False),
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
         primary_key=True,
-        default=lambda: str(uuid4()),
-    )
-    idempotency_key: Mapped[str | None] = mapped_column(
-        String(64), nullable=True, index=True
+        server_default=text("gen_uuid_v7()"),
     )
-    lead_id: Mapped[str | None] = mapped_column(
-        UUID(as_uuid=False),
+    idempotency_key: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # as_uuid: rows carry UUID objects as read (no per-row str formatting);
+    # binds still accept the str ids the lead helpers return.
+    lead_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
         ForeignKey("leads.id"),
         nullable=True,
         index=True,
@@ -92,6 +147,11 @@ class Run(Base):
     workflow: Mapped[str | None] = mapped_column(String(64), nullable=True)
     payload_json: Mapped[dict] = mapped_column(JSONB, nullable=False)
     result_json: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    # Stored copy of result_json.qualified so list filters can use an index.
+    qualified: Mapped[bool | None] = mapped_column(
+        Boolean,
+        Computed(RUN_QUALIFIED_SQL, persisted=True),
+    )
     status: Mapped[str] = mapped_column(
         String(20), nullable=False
     )  # pending | success | failed
@@ -154,7 +214,7 @@ class Opportunity(Base):
     id: Mapped[str] = mapped_column(
         UUID(as_uuid=False),
         primary_key=True,
-        default=lambda: str(uuid4()),
+        server_default=text("gen_random_uuid()"),
     )
     title: Mapped[str] = mapped_column(String(512), nullable=False)
     source: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
@@ -184,7 +244,7 @@ class AiAnalysis(Base):
     id: Mapped[str] = mapped_column(
         UUID(as_uuid=False),
         primary_key=True,
-        default=lambda: str(uuid4()),
+        server_default=text("gen_random_uuid()"),
     )
     opportunity_id: Mapped[str] = mapped_column(
         UUID(as_uuid=False),
@@ -212,7 +272,7 @@ class OpportunityScore(Base):
     id: Mapped[str] = mapped_column(
         UUID(as_uuid=False),
         primary_key=True,
-        default=lambda: str(uuid4()),
+        server_default=text("gen_random_uuid()"),
     )
     opportunity_id: Mapped[str] = mapped_column(
         UUID(as_uuid=False),
@@ -236,7 +296,7 @@ class CrmRecord(Base):
     id: Mapped[str] = mapped_column(
         UUID(as_uuid=False),
         primary_key=True,
-        default=lambda: str(uuid4()),
+        server_default=text("gen_random_uuid()"),
     )
     opportunity_id: Mapped[str] = mapped_column(
         UUID(as_uuid=False),
@@ -1,25 +1,64 @@
-from sqlalchemy import delete, func, select, update
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Text,
+    and_,
+    bindparam,
+    case,
+    cast,
+    column,
+    delete,
+    func,
+    literal_column,
+    or_,
+    select,
+    table,
+    text,
+    update,
+)
+from sqlalchemy.dialects.postgresql import JSONB, insert
+from sqlalchemy.engine import Row
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from api.db.models import IdempotencyKey, Run
 
+# Unfiltered run counts above this use the planner's row estimate instead of
+# a full COUNT(*) scan; below it the exact count is cheap enough.
+EXACT_COUNT_THRESHOLD = 10_000
+
+_pg_class = table("pg_class", column("oid"), column("reltuples"))
+
+# Read-only listings select plain column rows instead of ORM entities: no
+# identity-map entry or instance state per row, same attribute access.
+RUN_COLUMNS = tuple(Run.__table__.c)
+
 
 # ======================================================
 # IDEMPOTENCY HELPERS
 # ======================================================
 
+# Hot-path statements are built once at import; per call only the bound
+# parameters change (no select() construction or cache-key generation).
+_GET_EXISTING_RUN_STMT = (
+    select(Run)
+    # 'success' is inlined (not bound) so generic plans of the prepared
+    # statement can still prove the idx_runs_idempotency_success predicate.
+    .where(Run.idempotency_key == bindparam("k"), Run.status == literal_column("'success'"))
+    .order_by(Run.created_at.desc())
+    .limit(1)
+)
+_GET_RUN_BY_ID_STMT = select(Run).where(Run.id == bindparam("run_id"))
+
+
 async def get_existing_run_by_key(
     session: AsyncSession, idempotency_key: str
 ) -> Run | None:
     """Return the most recent successful run for this idempotency key."""
-    stmt = (
-        select(Run)
-        .where(Run.idempotency_key == idempotency_key, Run.status == "success")
-        .order_by(Run.created_at.desc())
-        .limit(1)
-    )
-    result = await session.execute(stmt)
+    result = await session.execute(_GET_EXISTING_RUN_STMT, {"k": idempotency_key})
     return result.scalar_one_or_none()
 
 
@@ -37,6 +76,40 @@ async def try_create_idempotency_key(session: AsyncSession, key: str) -> bool:
         return False
 
 
+# Claim the key and look up the latest successful result in one round-trip.
+# The CTE insert and the runs lookup share a snapshot, so "claimed" and
+# "result_json" are consistent with each other.
+_CLAIM_OR_FETCH_SQL = text(
+    """
+    WITH ins AS (
+        INSERT INTO idempotency_keys (key) VALUES (:k)
+        ON CONFLICT (key) DO NOTHING
+        RETURNING key
+    )
+    SELECT (SELECT key FROM ins) IS NOT NULL AS claimed, r.result_json
+    FROM (SELECT 1) AS dummy
+    LEFT JOIN LATERAL (
+        SELECT result_json
+        FROM runs
+        WHERE idempotency_key = :k AND status = 'success'
+        ORDER BY created_at DESC
+        LIMIT 1
+    ) AS r ON TRUE
+    """
+).columns(claimed=Boolean, result_json=JSONB)
+
+
+async def claim_or_fetch(session: AsyncSession, key: str) -> tuple[bool, dict | None]:
+    """
+    Atomically claim an idempotency key and fetch any cached result.
+
+    Returns (claimed, result_json). claimed is False when the key already
+    existed; result_json is the latest successful run's result, if any.
+    """
+    row = (await session.execute(_CLAIM_OR_FETCH_SQL, {"k": key})).one()
+    return bool(row.claimed), row.result_json
+
+
 async def delete_idempotency_key(session: AsyncSession, key: str) -> None:
     """Delete an idempotency key (after failure, so retries can reprocess)."""
     await session.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key))
@@ -47,35 +120,127 @@ async def delete_idempotency_key(session: AsyncSession, key: str) -> None:
 # RUN CRUD OPERATIONS
 # ======================================================
 
-async def list_runs(
-    session: AsyncSession,
+def _filter_runs(
+    stmt,
+    *,
     status: str | None = None,
     source: str | None = None,
     search: str | None = None,
-    limit: int = 50,
-    offset: int = 0,
-) -> list[Run]:
-    stmt = select(Run).order_by(Run.created_at.desc()).limit(limit).offset(offset)
+    qualified: bool | None = None,
+):
+    """Apply the shared /runs list filters to a select statement."""
     if status:
         stmt = stmt.where(Run.status == status)
     if source:
         stmt = stmt.where(Run.source.ilike(f"%{source}%"))
     if search:
-        from sqlalchemy import or_, cast, String
         stmt = stmt.where(
             or_(
                 Run.source.ilike(f"%{search}%"),
-                cast(Run.id, String).ilike(f"%{search}%"),
+                # Text (not VARCHAR) so the expression matches idx_runs_id_trgm.
+                cast(Run.id, Text).ilike(f"%{search}%"),
                 Run.error.ilike(f"%{search}%"),
             )
         )
+    if qualified is not None:
+        stmt = stmt.where(Run.qualified == qualified)
+    return stmt
+
+
+def _before_cursor(stmt, before: datetime | None, before_id: UUID | str | None):
+    """Apply the keyset cursor: runs older than the last one on the previous page."""
+    if before is None:
+        return stmt
+    if before_id is not None:
+        # Equivalent to (created_at, id) < (before, before_id), written so
+        # the created_at index bounds the scan.
+        return stmt.where(
+            Run.created_at <= before,
+            or_(Run.created_at < before, and_(Run.created_at == before, Run.id < before_id)),
+        )
+    return stmt.where(Run.created_at < before)
+
+
+async def list_runs(
+    session: AsyncSession,
+    status: str | None = None,
+    source: str | None = None,
+    search: str | None = None,
+    qualified: bool | None = None,
+    limit: int = 50,
+    offset: int = 0,
+    before: datetime | None = None,
+    before_id: UUID | str | None = None,
+) -> tuple[list[Row], int]:
+    """
+    List runs newest first, as lightweight rows (attribute access like Run),
+    together with the total matching the filters — one round-trip.
+
+    Pass the created_at/id of the last run on the previous page as
+    before/before_id for keyset pagination (no OFFSET scan). The total
+    ignores the cursor, as with count_runs.
+    """
+    filters = {"status": status, "source": source, "search": search, "qualified": qualified}
+    if not any((status, source, search, qualified is not None)):
+        total = _approximate_run_total()
+    elif before is None:
+        # Counted over the same filtered scan as the page
+        total = func.count().over()
+    else:
+        total = _filter_runs(select(func.count()).select_from(Run), **filters).scalar_subquery()
+
+    stmt = (
+        select(*RUN_COLUMNS, total.label("total"))
+        .order_by(Run.created_at.desc(), Run.id.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+    stmt = _before_cursor(_filter_runs(stmt, **filters), before, before_id)
     result = await session.execute(stmt)
-    return list(result.scalars().all())
+    rows = list(result.all())
+
+    if rows:
+        return rows, int(rows[0].total or 0)
+    if offset or before is not None:
+        # Paged past the end: no row to carry the total
+        return rows, await count_runs(session, **filters)
+    return rows, 0
+
+
+async def iter_runs(
+    session: AsyncSession,
+    status: str | None = None,
+    source: str | None = None,
+    search: str | None = None,
+    qualified: bool | None = None,
+    limit: int = 1000,
+    offset: int = 0,
+    before: datetime | None = None,
+    before_id: UUID | str | None = None,
+    yield_per: int = 200,
+) -> AsyncIterator[Row]:
+    """
+    Stream runs newest first through a server-side cursor.
+
+    Rows are fetched yield_per at a time, so memory stays bounded for large
+    exports and pages.
+    """
+    stmt = (
+        select(*RUN_COLUMNS)
+        .order_by(Run.created_at.desc(), Run.id.desc())
+        .limit(limit)
+        .offset(offset)
+        .execution_options(yield_per=yield_per)
+    )
+    stmt = _filter_runs(stmt, status=status, source=source, search=search, qualified=qualified)
+    stmt = _before_cursor(stmt, before, before_id)
+    result = await session.stream(stmt)
+    async for row in result:
+        yield row
 
 
 async def get_run_by_id(session: AsyncSession, run_id: str) -> Run | None:
-    stmt = select(Run).where(Run.id == run_id)
-    result = await session.execute(stmt)
+    result = await session.execute(_GET_RUN_BY_ID_STMT, {"run_id": run_id})
     return result.scalar_one_or_none()
 
 
@@ -84,25 +249,39 @@ async def count_runs(
     status: str | None = None,
     source: str | None = None,
     search: str | None = None,
+    qualified: bool | None = None,
 ) -> int:
+    if not any((status, source, search, qualified is not None)):
+        result = await session.execute(_APPROXIMATE_RUN_TOTAL_STMT)
+        return int(result.scalar() or 0)
+
     stmt = select(func.count()).select_from(Run)
-    if status:
-        stmt = stmt.where(Run.status == status)
-    if source:
-        stmt = stmt.where(Run.source.ilike(f"%{source}%"))
-    if search:
-        from sqlalchemy import or_, cast, String
-        stmt = stmt.where(
-            or_(
-                Run.source.ilike(f"%{search}%"),
-                cast(Run.id, String).ilike(f"%{search}%"),
-                Run.error.ilike(f"%{search}%"),
-            )
-        )
+    stmt = _filter_runs(stmt, status=status, source=source, search=search, qualified=qualified)
     result = await session.execute(stmt)
     return result.scalar() or 0
 
 
+def _approximate_run_total():
+    """
+    Total runs: pg_class.reltuples estimate for large tables, exact otherwise.
+
+    reltuples is -1 until the table is first analyzed, which also falls back
+    to the exact count.
+    """
+    reltuples = (
+        select(_pg_class.c.reltuples)
+        .where(_pg_class.c.oid == literal_column("'runs'::regclass"))
+        .scalar_subquery()
+    )
+    return case(
+        (reltuples >= EXACT_COUNT_THRESHOLD, cast(reltuples, BigInteger)),
+        else_=select(func.count()).select_from(Run).scalar_subquery(),
+    )
+
+
+_APPROXIMATE_RUN_TOTAL_STMT = select(_approximate_run_total())
+
+
 async def create_run(
     session: AsyncSession,
     source: str,
@@ -134,6 +313,41 @@ async def create_run(
     return run
 
 
+async def record_failure_and_release(
+    session: AsyncSession,
+    *,
+    source: str,
+    payload_json: dict,
+    error: str,
+    idempotency_key: str | None = None,
+    lead_id: str | None = None,
+) -> None:
+    """
+    Log a failed run and release its idempotency key in one statement.
+
+    WITH new_run AS (INSERT INTO runs ...) DELETE FROM idempotency_keys ...
+    so the failure path costs one round-trip instead of two.
+    """
+    insert_run = insert(Run).values(
+        source=source,
+        payload_json=payload_json,
+        status="failed",
+        error=error,
+        idempotency_key=idempotency_key,
+        lead_id=lead_id,
+    )
+    if not idempotency_key:
+        await session.execute(insert_run)
+        return
+
+    new_run = insert_run.returning(Run.id).cte("new_run")
+    await session.execute(
+        delete(IdempotencyKey)
+        .where(IdempotencyKey.key == idempotency_key)
+        .add_cte(new_run)
+    )
+
+
 async def update_run(
     session: AsyncSession,
     run_id: str,
@@ -141,7 +355,8 @@ async def update_run(
     status: str | None = None,
     result_json: dict | None = None,
     error: str | None = None,
-) -> Run:
+) -> Run | None:
+    """Update a run by id; returns the updated Run, or None if no row matched."""
     values = {}
     if status is not None:
         values["status"] = status
@@ -153,29 +368,26 @@ async def update_run(
     if not values:
         raise ValueError("No fields to update")
 
+    # If the run reached a terminal state, set completed_at once.
+    if status in ("success", "failed"):
+        values["completed_at"] = func.coalesce(Run.completed_at, func.now())
+
+    # Single UPDATE ... RETURNING; populate_existing refreshes any Run already
+    # in the session's identity map with the returned values.
     stmt = (
         update(Run)
         .where(Run.id == run_id)
         .values(**values)
-        .execution_options(synchronize_session="fetch")
+        .returning(Run)
+        .execution_options(synchronize_session=False, populate_existing=True)
     )
-    await session.execute(stmt)
-    await session.flush()
-
-    # If the run reached a terminal state, set completed_at once.
-    if status in ("success", "failed"):
-        await session.execute(
-            update(Run)
-            .where(Run.id == run_id, Run.completed_at.is_(None))
-            .values(completed_at=func.now())
-        )
-        await session.flush()
-
-    result = await session.execute(select(Run).where(Run.id == run_id))
-    return result.scalar_one()
+    result = await session.execute(stmt)
+    return result.scalar_one_or_none()
 
 
-async def delete_run(session: AsyncSession, run_id: str) -> None:
-    """Hard delete run (admin/system only)."""
-    await session.execute(delete(Run).where(Run.id == run_id))
-    await session.flush()
\ No newline at end of file
+async def delete_run(session: AsyncSession, run_id: str) -> Row | None:
+    """Hard delete run (admin/system only). Returns (id, idempotency_key), or None if no row matched."""
+    result = await session.execute(
+        delete(Run).where(Run.id == run_id).returning(Run.id, Run.idempotency_key)
+    )
+    return result.first()
\ No newline at end of file
@@ -2,9 +2,11 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.engine.url import URL
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from api.config import settings
 from api.db.models import Base
+from api.services.json_codec import dumps_json, loads_json
 
 DATABASE_URL = (
     settings.database_url
@@ -19,9 +21,36 @@ DATABASE_URL = (
     )
 )
 
+
+def _json_serializer(value) -> str:
+    """Encode JSON/JSONB bind values (the asyncpg codec expects str)."""
+    return dumps_json(value).decode()
+
+
 engine = create_async_engine(
     DATABASE_URL,
     echo=settings.log_level.upper() == "DEBUG",
+    # Room for every distinct compiled statement (default 500) so hot queries
+    # never fall out of the compiled cache.
+    query_cache_size=2000,
+    # Keep warm connections so requests skip asyncpg connect + type introspection.
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_pre_ping=True,
+    pool_recycle=settings.db_pool_recycle_seconds,
+    pool_use_lifo=True,
+    connect_args={
+        # Per-connection prepared statements, so repeated queries skip
+        # server-side parse/plan (SQLAlchemy's cache; asyncpg's own for the rest).
+        "prepared_statement_cache_size": settings.db_statement_cache_size,
+        "statement_cache_size": settings.db_statement_cache_size,
+        # JIT only adds planning overhead for these short OLTP queries.
+        "server_settings": {"jit": "off"},
+    },
+    # payload_json/result_json go through json_codec (orjson, exact for big ints).
+    json_serializer=_json_serializer,
+    json_deserializer=loads_json,
 )
 
 async_session = async_sessionmaker(
@@ -34,6 +63,6 @@ async_session = async_sessionmaker(
 
 
 async def init_db():
-    """Create tables if they don't exist (safe to call on every startup)."""
+    """Create tables if they don't exist (development; production uses migrations/)."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
@@ -8,19 +8,30 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from api.config import get_settings
 from api.db.session import init_db
 from api.routes import enrich, leads, metrics, opportunities, runs, settings
-from api.schemas.common import error_message, success_response
+from api.schemas.common import JSONResponse, error_message, success_response
+from api.services.idempotency_cache import close_redis
+from api.services.openai_client import close_openai_client
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Initialize DB tables on startup (idempotent via CREATE TABLE IF NOT EXISTS)."""
-    await init_db()
+    """
+    Optionally create DB tables on startup (AUTO_CREATE_SCHEMA or LOG_LEVEL=DEBUG).
+
+    Production schemas are managed by migrations/, so startup skips the
+    metadata round-trips and avoids racing create_all across workers.
+    """
+    config = get_settings()
+    if config.auto_create_schema or config.log_level.upper() == "DEBUG":
+        await init_db()
     yield
+    await close_openai_client()
+    await close_redis()
 
 
 app = FastAPI(
@@ -28,6 +39,7 @@ app = FastAPI(
     description="Automatic lead qualification, routing, and logging with retry safety.",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=JSONResponse,
 )
 
 app.add_middleware(
@@ -4,27 +4,30 @@ POST /enrich-lead — Lead qualification and extraction.
 Idempotent, retry-safe, full audit trail.
 """
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
 
 from api.config import settings
-from api.db.repository import (
-    create_run,
-    delete_idempotency_key,
-    get_existing_run_by_key,
-    try_create_idempotency_key,
-)
+from api.db.repository import claim_or_fetch, create_run, record_failure_and_release
 from api.db.session import async_session
-from api.schemas.common import success_response
-from api.schemas.enrich import EnrichLeadResponse
+from api.schemas.common import JSONResponse, success_response
 from api.services.idempotency import compute_idempotency_key
-from api.services.llm_enrichment import enrich_lead_with_llm
+from api.services.idempotency_cache import (
+    claim_inflight,
+    get_cached_result,
+    release_inflight,
+    store_result,
+)
+from api.services.json_codec import loads_json
+from api.services.llm_enrichment import enrich_lead_cached
 from api.db.leads_repository import ensure_lead_from_payload, apply_enrichment_to_lead
 
 router = APIRouter()
 
+MAX_PAYLOAD_BYTES = settings.max_payload_bytes
+
 
 @router.post("")
-async def enrich_lead(request: Request):
+async def enrich_lead(request: Request, background_tasks: BackgroundTasks):
     """
     Enrich and qualify a lead from a raw JSON payload.
 
@@ -35,15 +38,15 @@ async def enrich_lead(request: Request):
     """
     # ── 0. Size guard ────────────────────────────────────────────────────────
     content_length = request.headers.get("content-length")
-    if content_length and int(content_length) > settings.max_payload_bytes:
+    if content_length and int(content_length) > MAX_PAYLOAD_BYTES:
         raise HTTPException(
             status_code=413,
-            detail=f"Payload too large. Maximum size is {settings.max_payload_bytes} bytes.",
+            detail=f"Payload too large. Maximum size is {MAX_PAYLOAD_BYTES} bytes.",
         )
 
     # ── 1. Parse body ────────────────────────────────────────────────────────
     try:
-        payload = await request.json()
+        payload = loads_json(await request.body())
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid JSON body.")
 
@@ -54,66 +57,73 @@ async def enrich_lead(request: Request):
     source = _extract_source(payload)
     lead_id = None
 
-    # Ensure a lead row exists early (no LLM call here)
+    # ── 2. Redis front (optional): cached hit or duplicate in flight ────────
+    # A Redis hit returns before the lead upsert in step 3, so repeats served
+    # from it do not touch the lead row (missing name/phone, latest_source).
     if idempotency_key:
-        async with async_session() as session:
-            lead_id = await ensure_lead_from_payload(
-                session=session,
-                idempotency_key=idempotency_key,
-                payload=payload,
-                source=source,
+        cached_result = await get_cached_result(idempotency_key)
+        if cached_result:
+            return JSONResponse(
+                success_response(data=cached_result, message="Lead enriched (cached).")
+            )
+        if not await claim_inflight(idempotency_key):
+            raise HTTPException(
+                status_code=409,
+                detail="Duplicate request in progress. Retry after a few seconds.",
+                headers={"Retry-After": "5"},
             )
-            await session.commit()
 
-    # ── 2. Idempotency check (skip if no key — anonymous lead) ───────────────
+    # ── 3. Lead upsert + idempotency check (skip if no key — anonymous lead) ─
     if idempotency_key:
-        async with async_session() as session:
-            existing_run = await get_existing_run_by_key(session, idempotency_key)
-            if existing_run and existing_run.result_json:
-                await session.commit()
-                data = EnrichLeadResponse.model_validate(existing_run.result_json)
-                return success_response(data=data.model_dump(), message="Lead enriched (cached).")
-
-            # Atomically claim this request
-            created = await try_create_idempotency_key(session, idempotency_key)
-            if not created:
-                # Lost race — check if the winner already finished
-                existing_run = await get_existing_run_by_key(session, idempotency_key)
-                if existing_run and existing_run.result_json:
-                    await session.commit()
-                    data = EnrichLeadResponse.model_validate(existing_run.result_json)
-                    return success_response(data=data.model_dump(), message="Lead enriched (cached).")
-                raise HTTPException(
-                    status_code=409,
-                    detail="Duplicate request in progress. Retry after a few seconds.",
-                    headers={"Retry-After": "5"},
+        # One transaction: ensure the lead row exists, then claim the key and
+        # fetch any cached result. The connection goes back to the pool before
+        # the LLM call below.
+        try:
+            async with async_session() as session:
+                lead_id = await ensure_lead_from_payload(
+                    session=session,
+                    idempotency_key=idempotency_key,
+                    payload=payload,
+                    source=source,
                 )
+                created, cached_result = await claim_or_fetch(session, idempotency_key)
+                await session.commit()
+        except Exception:
+            await release_inflight(idempotency_key)
+            raise
+
+        if cached_result:
+            # result_json was written by this service from a validated
+            # EnrichLeadResponse, so it is trusted and returned as-is.
+            await store_result(idempotency_key, cached_result)
+            return JSONResponse(
+                success_response(data=cached_result, message="Lead enriched (cached).")
+            )
+        if not created:
+            # Lost race and the winner has not finished yet
+            await release_inflight(idempotency_key)
+            raise HTTPException(
+                status_code=409,
+                detail="Duplicate request in progress. Retry after a few seconds.",
+                headers={"Retry-After": "5"},
+            )
 
-            await session.commit()
-
-    # ── 3. LLM enrichment (outside DB transaction — network I/O) ────────────
+    # ── 4. LLM enrichment (outside DB transaction — network I/O) ────────────
     try:
-        result = await enrich_lead_with_llm(payload)
+        result, cache_hit = await enrich_lead_cached(payload)
     except Exception as e:
-        async with async_session() as session:
-            await create_run(
-                session=session,
-                source=source,
-                workflow=None,
-                payload_json=payload,
-                result_json=None,
-                status="failed",
-                error=str(e),
-                idempotency_key=idempotency_key,
-                lead_id=lead_id,
-            )
-            if idempotency_key:
-                # Release the key so the caller can retry
-                await delete_idempotency_key(session, idempotency_key)
-            await session.commit()
-        raise HTTPException(status_code=502, detail=f"Enrichment failed: {e}") from e
+        # Log the failure and release the key after the 502 has been sent.
+        # Returned rather than raised: FastAPI drops background tasks when
+        # the handler raises.
+        background_tasks.add_task(
+            _log_failure, source, payload, str(e), idempotency_key, lead_id
+        )
+        return JSONResponse(
+            status_code=502,
+            content={"success": False, "message": f"Enrichment failed: {e}"},
+        )
 
-    # ── 4. Persist successful run ────────────────────────────────────────────
+    # ── 5. Persist successful run ────────────────────────────────────────────
     result_dict = result.model_dump()
     async with async_session() as session:
         run = await create_run(
@@ -135,15 +145,48 @@ async def enrich_lead(request: Request):
             )
         await session.commit()
 
-    return success_response(data=result.model_dump(), message="Lead enriched successfully.")
+    if idempotency_key:
+        await store_result(idempotency_key, result_dict)
+
+    return JSONResponse(
+        success_response(data=result_dict, message="Lead enriched successfully."),
+        headers={"X-Cache": "HIT" if cache_hit else "MISS"},
+    )
 
 
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
+async def _log_failure(
+    source: str,
+    payload: dict,
+    error: str,
+    idempotency_key: str,
+    lead_id: str | None,
+) -> None:
+    """Persist the failed run and release the key so the caller can retry."""
+    try:
+        async with async_session() as session:
+            await record_failure_and_release(
+                session,
+                source=source,
+                payload_json=payload,
+                error=error,
+                idempotency_key=idempotency_key,
+                lead_id=lead_id,
+            )
+            await session.commit()
+    finally:
+        if idempotency_key:
+            await release_inflight(idempotency_key)
+
+
 def _extract_source(payload: dict) -> str:
     """Extract originating source label from the payload for the audit trail."""
-    for key in ("source", "Source", "SOURCE", "origin", "channel"):
-        val = payload.get(key)
-        if val:
-            return str(val)
-    return "unknown"
\ No newline at end of file
+    return str(
+        payload.get("source")
+        or payload.get("Source")
+        or payload.get("SOURCE")
+        or payload.get("origin")
+        or payload.get("channel")
+        or "unknown"
+    )
\ No newline at end of file
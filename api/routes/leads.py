@@ -18,7 +18,7 @@ from api.db.repository import get_run_by_id
 from api.db.session import async_session
 from api.routes.runs import RunResponse
 from api.schemas.brief import LeadBriefResponse
-from api.schemas.common import success_response
+from api.schemas.common import JSONResponse, success_response
 from api.services.llm_lead_brief import generate_lead_brief
 
 router = APIRouter(prefix="/leads", tags=["leads"])
@@ -64,13 +64,6 @@ class LeadResponse(BaseModel):
         )
 
 
-class LeadListResponse(BaseModel):
-    leads: list[LeadResponse]
-    total: int
-    limit: int
-    offset: int
-
-
 class LeadUpdateRequest(BaseModel):
     status: Optional[str] = Field(None, examples=["new", "qualified", "unqualified", "contacted", "lost"])
     owner: Optional[str] = None
@@ -109,13 +102,13 @@ async def list_leads_api(
         )
         await session.commit()
 
-    data = LeadListResponse(
-        leads=[LeadResponse.from_lead(l) for l in leads],
-        total=total,
-        limit=limit,
-        offset=offset,
-    )
-    return success_response(data=data.model_dump(), message="Leads fetched successfully.")
+    data = {
+        "leads": [LeadResponse.from_lead(l).model_dump() for l in leads],
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+    }
+    return JSONResponse(success_response(data=data, message="Leads fetched successfully."))
 
 
 @router.get("/{lead_id}")
@@ -168,10 +161,9 @@ async def list_lead_runs_api(
     async with async_session() as session:
         runs = await list_runs_for_lead(session, lead_id=lead_id, limit=limit, offset=offset)
         await session.commit()
-    data = [RunResponse.from_run(r) for r in runs]
-    return success_response(
-        data=[r.model_dump() for r in data],
-        message="Lead runs retrieved successfully.",
+    data = [RunResponse.model_validate(r).model_dump(mode="json") for r in runs]
+    return JSONResponse(
+        success_response(data=data, message="Lead runs retrieved successfully.")
     )
 
 
@@ -28,7 +28,7 @@ from api.db.opportunities_repository import (
 )
 from api.db.company_profile_repository import get_company_profile_dict
 from api.db.session import async_session
-from api.schemas.common import success_response
+from api.schemas.common import JSONResponse, success_response
 from api.deps.rate_limit import check_rate_limit
 from api.services.llm_opportunity_analyzer import analyze_opportunity_with_retry
 from api.services.opportunity_matching import (
@@ -248,9 +248,11 @@ async def list_opportunities_api(
                 d["stage"] = crm_row.stage if crm_row else None
                 d["assigned_user"] = crm_row.assigned_user if crm_row else None
         await session.commit()
-        return success_response(
-            data={"opportunities": items, "total": total, "limit": limit, "offset": offset},
-            message="Opportunities retrieved successfully.",
+        return JSONResponse(
+            success_response(
+                data={"opportunities": items, "total": total, "limit": limit, "offset": offset},
+                message="Opportunities retrieved successfully.",
+            )
         )
 
 
@@ -8,11 +8,15 @@ Flow:
               →  returns the completed run
 """
 
+import asyncio
+import re
+from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import AliasPath, BaseModel, ConfigDict, Field, field_serializer
 
 from api.db.repository import (
     count_runs,
@@ -21,15 +25,24 @@ from api.db.repository import (
     delete_run,
     get_existing_run_by_key,
     get_run_by_id,
+    iter_runs,
     list_runs,
     try_create_idempotency_key,
     update_run,
 )
 from api.db.session import async_session
 from api.db.leads_repository import apply_enrichment_to_lead, ensure_lead_from_payload
-from api.schemas.common import success_response
+from api.schemas.common import JSONResponse, success_response
 from api.services.idempotency import compute_idempotency_key
-from api.services.llm_enrichment import enrich_lead_with_llm
+from api.services.idempotency_cache import delete_cached_result
+from api.services.json_codec import dumps_json
+from api.services.llm_enrichment import enrich_lead_cached
+from api.services.run_cache import (
+    cache_generation,
+    cache_run,
+    get_cached_run,
+    invalidate_run,
+)
 
 router = APIRouter(prefix="/runs", tags=["runs"])
 
@@ -58,8 +71,11 @@ class RunUpdateRequest(BaseModel):
 
 
 class RunResponse(BaseModel):
-    id: str
-    lead_id: Optional[str] = None
+    # Built straight from Run rows: RunResponse.model_validate(run)
+    model_config = ConfigDict(from_attributes=True, extra="ignore", defer_build=False)
+
+    id: UUID
+    lead_id: Optional[UUID] = None
     source: str
     status: str
     workflow: Optional[str] = None
@@ -69,32 +85,16 @@ class RunResponse(BaseModel):
     result_json: Optional[dict]
     error: Optional[str]
     idempotency_key: Optional[str]
-    created_at: str
-    completed_at: Optional[str] = None
-    # Flattened from result_json for frontend convenience
-    qualified: Optional[bool]
-    score: Optional[int]
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+    # Flattened from result_json for frontend convenience (qualified is the
+    # generated runs.qualified column)
+    qualified: Optional[bool] = None
+    score: Optional[int] = Field(None, validation_alias=AliasPath("result_json", "score"))
 
-    @classmethod
-    def from_run(cls, run) -> "RunResponse":
-        result = run.result_json or {}
-        return cls(
-            id=str(run.id),
-            lead_id=str(run.lead_id) if getattr(run, "lead_id", None) else None,
-            source=run.source,
-            status=run.status,
-            workflow=run.workflow,
-            priority=run.priority,
-            scheduled_at=run.scheduled_at,
-            payload_json=run.payload_json,
-            result_json=run.result_json,
-            error=run.error,
-            idempotency_key=run.idempotency_key,
-            created_at=run.created_at.isoformat() if run.created_at else "",
-            completed_at=run.completed_at.isoformat() if run.completed_at else None,
-            qualified=result.get("qualified"),
-            score=result.get("score"),
-        )
+    @field_serializer("created_at", "completed_at")
+    def _isoformat(self, value: Optional[datetime]) -> Optional[str]:
+        return value.isoformat() if value else None
 
 
 class RunCreateResponse(BaseModel):
@@ -107,21 +107,33 @@ class RunCreateResponse(BaseModel):
     created_at: str
 
 
-class RunListResponse(BaseModel):
-    runs: list[RunResponse]
-    total: int
-    limit: int
-    offset: int
-
-
 # ============================================================
 # Helpers
 # ============================================================
 
+def _cached_run_response(existing_run) -> dict:
+    """Success envelope for a POST /runs answered from an earlier run."""
+    result = existing_run.result_json
+    payload = RunCreateResponse(
+        id=str(existing_run.id),
+        status=existing_run.status,
+        qualified=result.get("qualified") if isinstance(result, dict) else None,
+        score=result.get("score") if isinstance(result, dict) else None,
+        result_json=result if isinstance(result, dict) else None,
+        error=existing_run.error,
+        created_at=existing_run.created_at.isoformat() if existing_run.created_at else "",
+    )
+    return success_response(data=payload.model_dump(), message="Run completed (cached).")
+
+
+_UUID_RE = re.compile(
+    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\Z"
+)
+
+
 def _validate_uuid(run_id: str) -> None:
-    try:
-        UUID(run_id)
-    except ValueError:
+    # Format check only; no UUID object or exception on the valid path
+    if not _UUID_RE.match(run_id):
         raise HTTPException(status_code=400, detail="Invalid run ID format.")
 
 
@@ -134,22 +146,89 @@ async def list_runs_api(
     status: Optional[str] = Query(None, description="Filter: success | failed | pending"),
     source: Optional[str] = Query(None, description="Filter by source (partial match)"),
     search: Optional[str] = Query(None, description="Search run ID, source, or error"),
+    qualified: Optional[bool] = Query(None, description="Filter by AI qualification result"),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    before: Optional[datetime] = Query(
+        None, description="Keyset cursor: created_at of the last run on the previous page"
+    ),
+    before_id: Optional[UUID] = Query(
+        None, description="Keyset cursor: id of the last run on the previous page"
+    ),
+    stream: bool = Query(
+        False, description="Stream the response as rows are fetched (large pages / payloads)"
+    ),
 ):
-    """Return paginated, optionally filtered list of runs."""
+    """
+    Return paginated, optionally filtered list of runs.
+
+    For deep pages prefer the before/before_id keyset cursor over offset.
+    total is exact when filtered; unfiltered it is the planner estimate once
+    the table is large. With stream=true the same envelope is written out
+    row by row (total follows the runs array).
+    """
+    filters = {"status": status, "source": source, "search": search, "qualified": qualified}
+    if stream:
+        page = {"limit": limit, "offset": offset, "before": before, "before_id": before_id}
+        return StreamingResponse(
+            _stream_runs_page(filters, page), media_type="application/json"
+        )
+
     async with async_session() as session:
-        runs = await list_runs(session, status=status, source=source, search=search, limit=limit, offset=offset)
-        total = await count_runs(session, status=status, source=source, search=search)
-        await session.commit()
+        runs, total = await list_runs(
+            session, **filters, limit=limit, offset=offset, before=before, before_id=before_id
+        )
 
-    data = RunListResponse(
-        runs=[RunResponse.from_run(r) for r in runs],
-        total=total,
-        limit=limit,
-        offset=offset,
-    )
-    return success_response(data=data.model_dump(), message="Runs retrieved successfully.")
+    # Envelope built directly (no list model to re-walk) and handed to orjson
+    data = {
+        "runs": [RunResponse.model_validate(r).model_dump(mode="json") for r in runs],
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+    }
+    return JSONResponse(success_response(data=data, message="Runs retrieved successfully."))
+
+
+async def _stream_runs_page(filters: dict, page: dict):
+    """Write the GET /runs envelope incrementally, 50 rows per DB fetch."""
+    yield b'{"success":true,"message":"Runs retrieved successfully.","data":{"runs":['
+    async with async_session() as session:
+        sep = b""
+        async for row in iter_runs(session, **filters, **page, yield_per=50):
+            yield sep + dumps_json(RunResponse.model_validate(row).model_dump(mode="json"))
+            sep = b","
+        # Counted once the cursor is closed (one statement per connection)
+        total = await count_runs(session, **filters)
+    tail = {"total": total, "limit": page["limit"], "offset": page["offset"]}
+    yield b"]," + dumps_json(tail)[1:] + b"}"
+
+
+# ============================================================
+# EXPORT RUNS  GET /runs/export
+# ============================================================
+
+@router.get("/export")
+async def export_runs_api(
+    status: Optional[str] = Query(None, description="Filter: success | failed | pending"),
+    source: Optional[str] = Query(None, description="Filter by source (partial match)"),
+    search: Optional[str] = Query(None, description="Search run ID, source, or error"),
+    qualified: Optional[bool] = Query(None, description="Filter by AI qualification result"),
+    limit: int = Query(1000, ge=1, le=10000),
+):
+    """
+    Stream runs as NDJSON (one RunResponse object per line), newest first.
+
+    Use this instead of GET /runs for bulk reads: rows are fetched through a
+    server-side cursor and written out as they arrive.
+    """
+    filters = {"status": status, "source": source, "search": search, "qualified": qualified}
+
+    async def ndjson_lines():
+        async with async_session() as session:
+            async for row in iter_runs(session, **filters, limit=limit):
+                yield RunResponse.model_validate(row).model_dump_json() + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
 
 
 # ============================================================
@@ -157,16 +236,35 @@ async def list_runs_api(
 # ============================================================
 
 @router.get("/{run_id}")
-async def get_run_api(run_id: str):
-    """Fetch a single run by UUID."""
+async def get_run_api(run_id: str, request: Request):
+    """
+    Fetch a single run by UUID.
+
+    Responses carry a weak ETag; send it back as If-None-Match to get a 304
+    while the run is unchanged. With RUN_CACHE_TTL_SECONDS set, repeated polls
+    of a finished run are served from a short-lived in-process cache.
+    """
     _validate_uuid(run_id)
-    async with async_session() as session:
-        run = await get_run_by_id(session, run_id)
-        if not run:
-            raise HTTPException(status_code=404, detail="Run not found.")
-        await session.commit()
-    data = RunResponse.from_run(run)
-    return success_response(data=data.model_dump(), message="Run retrieved successfully.")
+    cached = await get_cached_run(run_id)
+    if cached:
+        etag, body = cached
+    else:
+        generation = cache_generation()
+        async with async_session() as session:
+            run = await get_run_by_id(session, run_id)
+            if not run:
+                raise HTTPException(status_code=404, detail="Run not found.")
+        data = RunResponse.model_validate(run)
+        body = dumps_json(
+            success_response(
+                data=data.model_dump(mode="json"), message="Run retrieved successfully."
+            )
+        )
+        etag = await cache_run(run_id, body, run.status, generation)
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
 
 
 # ============================================================
@@ -181,47 +279,28 @@ async def create_run_api(data: RunCreateRequest):
     Flow:
       1. Save run as status="pending" with the raw payload
       2. Call OpenAI to qualify the lead (score, qualified, reasons, extracted fields)
+         — started as soon as the idempotency key is claimed, so it overlaps step 1
       3. Update run to status="success" + result_json  (or "failed" + error)
       4. Return the completed run
     """
 
-    # ── Step 0: Idempotency guard (must happen before LLM call) ───────────────
+    # ── Steps 0-1: Idempotency guard + pending run, one transaction ──────────
     idempotency_key = compute_idempotency_key(data.payload_json)
     lead_id = None
 
-    if idempotency_key:
-        async with async_session() as session:
+    async with async_session() as session:
+        if idempotency_key:
             existing_run = await get_existing_run_by_key(session, idempotency_key)
             if existing_run and existing_run.result_json:
-                await session.commit()
-                result = existing_run.result_json
-                payload = RunCreateResponse(
-                    id=str(existing_run.id),
-                    status=existing_run.status,
-                    qualified=result.get("qualified") if isinstance(result, dict) else None,
-                    score=result.get("score") if isinstance(result, dict) else None,
-                    result_json=result if isinstance(result, dict) else None,
-                    error=existing_run.error,
-                    created_at=existing_run.created_at.isoformat() if existing_run.created_at else "",
-                )
-                return success_response(data=payload.model_dump(), message="Run completed (cached).")
+                return _cached_run_response(existing_run)
 
+            # Must happen before the LLM call (and before any other write:
+            # a lost race rolls the transaction back)
             created = await try_create_idempotency_key(session, idempotency_key)
             if not created:
                 existing_run = await get_existing_run_by_key(session, idempotency_key)
                 if existing_run and existing_run.result_json:
-                    await session.commit()
-                    result = existing_run.result_json
-                    payload = RunCreateResponse(
-                        id=str(existing_run.id),
-                        status=existing_run.status,
-                        qualified=result.get("qualified") if isinstance(result, dict) else None,
-                        score=result.get("score") if isinstance(result, dict) else None,
-                        result_json=result if isinstance(result, dict) else None,
-                        error=existing_run.error,
-                        created_at=existing_run.created_at.isoformat() if existing_run.created_at else "",
-                    )
-                    return success_response(data=payload.model_dump(), message="Run completed (cached).")
+                    return _cached_run_response(existing_run)
 
                 raise HTTPException(
                     status_code=409,
@@ -229,38 +308,44 @@ async def create_run_api(data: RunCreateRequest):
                     headers={"Retry-After": "5"},
                 )
 
-            await session.commit()
+        # The LLM call needs nothing from the pending row: start it now and
+        # let the lead upsert + insert + commit run while it is in flight.
+        llm_task = asyncio.create_task(enrich_lead_cached(data.payload_json))
+        try:
+            if idempotency_key:
+                lead_id = await ensure_lead_from_payload(
+                    session=session,
+                    idempotency_key=idempotency_key,
+                    payload=data.payload_json,
+                    source=data.source,
+                )
 
-    # ── Step 1: Save pending run ──────────────────────────────────────────────
-    async with async_session() as session:
-        if idempotency_key:
-            lead_id = await ensure_lead_from_payload(
+            # INSERT ... RETURNING fills id/created_at on flush
+            run = await create_run(
                 session=session,
-                idempotency_key=idempotency_key,
-                payload=data.payload_json,
                 source=data.source,
+                workflow=data.workflow,
+                payload_json=data.payload_json,
+                result_json=None,
+                status="pending",
+                priority=data.priority,
+                scheduled_at=data.scheduled_at,
+                error=None,
+                idempotency_key=idempotency_key or None,
+                lead_id=lead_id,
             )
-
-        run = await create_run(
-            session=session,
-            source=data.source,
-            workflow=data.workflow,
-            payload_json=data.payload_json,
-            result_json=None,
-            status="pending",
-            priority=data.priority,
-            scheduled_at=data.scheduled_at,
-            error=None,
-            idempotency_key=idempotency_key or None,
-            lead_id=lead_id,
-        )
-        await session.commit()
+            await session.commit()
+        except BaseException:
+            llm_task.cancel()
+            raise
         run_id = str(run.id)
         created_at = run.created_at.isoformat() if run.created_at else ""
 
-    # ── Step 2: Run AI enrichment ─────────────────────────────────────────────
+    # ── Step 2: Collect AI enrichment ─────────────────────────────────────────
+    headers = {}
     try:
-        result = await enrich_lead_with_llm(data.payload_json)
+        result, cache_hit = await llm_task
+        headers["X-Cache"] = "HIT" if cache_hit else "MISS"
         result_dict = result.model_dump()
         final_status = "success"
         error_msg = None
@@ -280,9 +365,11 @@ async def create_run_api(data: RunCreateRequest):
         )
         if final_status == "failed" and idempotency_key:
             await delete_idempotency_key(session, idempotency_key)
-        if final_status == "success" and lead_id:
+        if final_status == "success" and lead_id and updated is not None:
             await apply_enrichment_to_lead(session=session, lead_id=lead_id, run=updated)
         await session.commit()
+    # A poll during processing may have cached the pending run
+    await invalidate_run(run_id)
 
     # ── Step 4: Return ────────────────────────────────────────────────────────
     qualified = result_dict.get("qualified") if result_dict else None
@@ -298,7 +385,11 @@ async def create_run_api(data: RunCreateRequest):
         created_at=created_at,
     )
     msg = "Lead qualified successfully." if final_status == "success" else "Run failed."
-    return success_response(data=payload.model_dump(), message=msg)
+    return JSONResponse(
+        success_response(data=payload.model_dump(), message=msg),
+        status_code=201,
+        headers=headers,
+    )
 
 
 # ============================================================
@@ -317,10 +408,6 @@ async def update_run_api(run_id: str, data: RunUpdateRequest):
         )
 
     async with async_session() as session:
-        run = await get_run_by_id(session, run_id)
-        if not run:
-            raise HTTPException(status_code=404, detail="Run not found.")
-
         updated = await update_run(
             session=session,
             run_id=run_id,
@@ -328,7 +415,12 @@ async def update_run_api(run_id: str, data: RunUpdateRequest):
             result_json=data.result_json,
             error=data.error,
         )
+        if updated is None:
+            raise HTTPException(status_code=404, detail="Run not found.")
         await session.commit()
+    await invalidate_run(run_id)
+    if updated.idempotency_key:
+        await delete_cached_result(updated.idempotency_key)
 
     return success_response(
         data={"id": run_id, "status": updated.status},
@@ -346,11 +438,12 @@ async def delete_run_api(run_id: str):
     _validate_uuid(run_id)
 
     async with async_session() as session:
-        run = await get_run_by_id(session, run_id)
-        if not run:
+        deleted = await delete_run(session, run_id)
+        if deleted is None:
             raise HTTPException(status_code=404, detail="Run not found.")
-
-        await delete_run(session, run_id)
         await session.commit()
+    await invalidate_run(run_id)
+    if deleted.idempotency_key:
+        await delete_cached_result(deleted.idempotency_key)
 
     return success_response(data={"deleted": run_id}, message="Run deleted successfully.")
\ No newline at end of file
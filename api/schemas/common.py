@@ -2,6 +2,17 @@
 
 from typing import Any, Optional
 
+from fastapi.responses import ORJSONResponse
+
+from api.services.json_codec import dumps_json
+
+
+class JSONResponse(ORJSONResponse):
+    """ORJSONResponse that still renders payloads orjson rejects (see dumps_json)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
 
 def success_response(data: Any = None, message: Optional[str] = None) -> dict:
     """Return a standard success envelope: { success, message?, data? }."""
@@ -7,6 +7,11 @@ sha256(email + phone) - normalized for consistent hashing.
 import hashlib
 import re
 
+EMAIL_KEYS = ("email", "Email", "EMAIL")
+PHONE_KEYS = ("phone", "Phone", "PHONE", "mobile", "tel")
+
+_NON_DIGITS = re.compile(r"\D+")
+
 
 def compute_idempotency_key(payload: dict) -> str:
     """
@@ -15,21 +20,25 @@ def compute_idempotency_key(payload: dict) -> str:
     Uses sha256(email + phone). Extracts email/phone from common field names
     (case-insensitive). Empty/missing values normalized to empty string.
     """
-    email = _extract_string(payload, ["email", "Email", "EMAIL"]).lower()
-    phone = _extract_string(payload, ["phone", "Phone", "PHONE", "mobile", "tel"])
+    email = _extract_string(payload, EMAIL_KEYS).lower()
+    phone = _extract_string(payload, PHONE_KEYS)
 
     # Normalize phone to digits only to avoid hash drift across formats.
-    phone_norm = re.sub(r"\D+", "", phone)
+    phone_norm = _NON_DIGITS.sub("", phone)
 
     # If we can't identify a lead deterministically, do NOT generate a key.
     if not email and not phone_norm:
         return ""
 
-    combined = f"{email}{phone_norm}"
-    return hashlib.sha256(combined.encode("utf-8")).hexdigest()
+    # No separator: existing keys in the database were hashed this way.
+    # Not a security use, so skip the FIPS check.
+    return hashlib.sha256(
+        email.encode("utf-8") + phone_norm.encode("utf-8"),
+        usedforsecurity=False,
+    ).hexdigest()
 
 
-def _extract_string(payload: dict, keys: list[str]) -> str:
+def _extract_string(payload: dict, keys: tuple[str, ...]) -> str:
     """Extract first matching key value as string."""
     for key in keys:
         if key in payload and payload[key] is not None:
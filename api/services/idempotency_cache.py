@@ -0,0 +1,105 @@
+"""
+Redis front for /enrich-lead idempotency.
+
+Absorbs cached hits and duplicate in-flight requests before they reach
+Postgres. Disabled unless REDIS_URL is set; any Redis error falls through
+to the Postgres path, which stays the source of truth: PUT/DELETE on a run
+drop the cached result for its key.
+"""
+
+import logging
+
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from api.config import settings
+
+logger = logging.getLogger(__name__)
+
+RESULT_TTL_SECONDS = 86400
+INFLIGHT_TTL_SECONDS = 60
+
+_redis: Redis | None = None
+
+
+def get_redis() -> Redis | None:
+    """Return the shared pooled Redis client, or None when REDIS_URL is unset."""
+    global _redis
+    if _redis is None and settings.redis_url:
+        _redis = Redis.from_url(settings.redis_url)
+    return _redis
+
+
+async def close_redis() -> None:
+    """Close the shared client and its connection pool (app shutdown)."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+async def get_cached_result(key: str) -> dict | None:
+    """Return the cached enrichment result for this idempotency key, if any."""
+    redis = get_redis()
+    if redis is None:
+        return None
+    try:
+        raw = await redis.get(f"lead:{key}")
+    except RedisError:
+        logger.warning("Redis GET failed; falling back to Postgres", exc_info=True)
+        return None
+    return orjson.loads(raw) if raw else None
+
+
+async def delete_cached_result(key: str) -> None:
+    """Drop the cached result after the run behind it changes or is deleted."""
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.delete(f"lead:{key}")
+    except RedisError:
+        logger.warning("Redis result cache DEL failed; entry expires in %ss", RESULT_TTL_SECONDS, exc_info=True)
+
+
+async def claim_inflight(key: str) -> bool:
+    """
+    Claim the key for processing (SET NX with a short TTL).
+
+    Returns False only when another request holds the claim. Without Redis
+    (or on error) returns True and Postgres arbitrates.
+    """
+    redis = get_redis()
+    if redis is None:
+        return True
+    try:
+        return bool(await redis.set(f"inflight:{key}", b"1", nx=True, ex=INFLIGHT_TTL_SECONDS))
+    except RedisError:
+        logger.warning("Redis SET NX failed; falling back to Postgres", exc_info=True)
+        return True
+
+
+async def release_inflight(key: str) -> None:
+    """Drop the in-flight claim so retries can proceed."""
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.delete(f"inflight:{key}")
+    except RedisError:
+        logger.warning("Redis DEL failed; claim expires in %ss", INFLIGHT_TTL_SECONDS, exc_info=True)
+
+
+async def store_result(key: str, result: dict) -> None:
+    """Cache a successful result and drop the in-flight claim."""
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.set(f"lead:{key}", orjson.dumps(result), ex=RESULT_TTL_SECONDS)
+            pipe.delete(f"inflight:{key}")
+            await pipe.execute()
+    except RedisError:
+        logger.warning("Redis result cache write failed", exc_info=True)
@@ -0,0 +1,36 @@
+"""
+JSON encode/decode on orjson, with a stdlib json fallback.
+
+orjson only holds integers in 64 bits: it raises on larger ones when
+encoding and decodes them as floats. Those documents (and anything else
+orjson rejects) go through stdlib json so values round-trip exactly.
+"""
+
+import json
+import re
+from typing import Any, Callable
+
+import orjson
+
+# 2**63 has 19 digits; shorter runs always fit orjson's integer range
+_LONG_DIGITS = re.compile(r"\d{19,}")
+_LONG_DIGITS_BYTES = re.compile(rb"\d{19,}")
+
+
+def dumps_json(value: Any, default: Callable[[Any], Any] | None = None) -> bytes:
+    """Compact UTF-8 JSON; non-str dict keys are stringified."""
+    try:
+        return orjson.dumps(value, default=default, option=orjson.OPT_NON_STR_KEYS)
+    except orjson.JSONEncodeError:
+        return json.dumps(value, default=default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def loads_json(data: str | bytes) -> Any:
+    """Parse JSON; raises ValueError (JSONDecodeError) on invalid input."""
+    pattern = _LONG_DIGITS_BYTES if isinstance(data, bytes) else _LONG_DIGITS
+    if pattern.search(data):
+        return json.loads(data)
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return json.loads(data)
@@ -0,0 +1,81 @@
+"""
+Response cache for deterministic LLM calls.
+
+Keyed by a hash of model + system prompt + normalized payload, so a repeated
+payload skips the OpenAI round trip. Backend is chosen via LLM_CACHE_BACKEND:
+"memory" (per-process TTL LRU, default), "redis" (shared, needs REDIS_URL)
+or "none".
+"""
+
+import hashlib
+import json
+import logging
+from typing import Protocol
+
+from redis.exceptions import RedisError
+
+from api.config import settings
+from api.services.idempotency_cache import get_redis
+from api.services.ttl_cache import MemoryCache
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> bytes | str | None: ...
+
+    async def set(self, key: str, value: str, ttl: int) -> None: ...
+
+    async def delete(self, key: str) -> None: ...
+
+
+class RedisCache:
+    """Shared cache on the REDIS_URL client. Errors count as misses."""
+
+    prefix = "llm:"
+
+    async def get(self, key: str) -> bytes | None:
+        redis = get_redis()
+        if redis is None:
+            return None
+        try:
+            return await redis.get(self.prefix + key)
+        except RedisError:
+            logger.warning("Redis LLM cache GET failed", exc_info=True)
+            return None
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        redis = get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.set(self.prefix + key, value, ex=ttl)
+        except RedisError:
+            logger.warning("Redis LLM cache SET failed", exc_info=True)
+
+    async def delete(self, key: str) -> None:
+        redis = get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.delete(self.prefix + key)
+        except RedisError:
+            logger.warning("Redis LLM cache DEL failed", exc_info=True)
+
+
+def _build_cache() -> CacheBackend | None:
+    backend = settings.llm_cache_backend.lower()
+    if backend == "memory":
+        return MemoryCache[str](maxsize=settings.llm_cache_max_entries)
+    if backend == "redis":
+        return RedisCache()
+    return None
+
+
+llm_cache: CacheBackend | None = _build_cache()
+
+
+def llm_cache_key(model: str, system_prompt: str, payload: dict) -> str:
+    """Stable key for one (model, prompt, payload) call; key order is ignored."""
+    normalized = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(f"{model}|{system_prompt}|{normalized}".encode()).hexdigest()
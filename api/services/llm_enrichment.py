@@ -4,14 +4,18 @@ LLM-based lead classification and structured extraction.
 Strict schema enforcement — fail loudly on mismatch.
 """
 
-import json
-import re
-
-from openai import AsyncOpenAI
-
 from api.config import settings
 from api.schemas.enrich import EnrichLeadResponse
+from api.services.json_codec import dumps_json
+from api.services.llm_cache import llm_cache, llm_cache_key
+from api.services.openai_client import get_openai_client
+
+# Bound once: parses and validates the raw JSON string in pydantic-core
+_VALIDATE_JSON = EnrichLeadResponse.__pydantic_validator__.validate_json
 
+# Responses are only cached at (near-)deterministic temperatures
+LLM_TEMPERATURE = 0.1
+CACHEABLE_MAX_TEMPERATURE = 0.1
 
 SYSTEM_PROMPT = """You are a lead qualification system. Analyze the raw lead payload and:
 1. Classify lead quality (qualified: true/false)
@@ -35,13 +39,67 @@ Output ONLY valid JSON matching this exact schema (no markdown, no extra text):
   }
 }"""
 
-
-def _build_client() -> AsyncOpenAI:
-    """Build the AsyncOpenAI client, optionally with a custom base URL."""
-    kwargs: dict = {"api_key": settings.openai_api_key}
-    if settings.openai_base_url:
-        kwargs["base_url"] = settings.openai_base_url
-    return AsyncOpenAI(**kwargs)
+# Prompt shape for provider-side prefix caching: the static system message
+# always comes first and byte-identical; only the user message varies.
+# OpenAI caches prefixes automatically from 1024 tokens; this prompt stays
+# well below that and is not padded just to qualify. Endpoints that
+# take explicit markers (Anthropic-style, e.g. via OpenRouter) get
+# cache_control on the system block with OPENAI_PROMPT_CACHE_CONTROL=true.
+if settings.openai_prompt_cache_control:
+    SYSTEM_MESSAGE: dict = {
+        "role": "system",
+        "content": [
+            {"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
+        ],
+    }
+else:
+    SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
+
+def _nullable(type_: str) -> dict:
+    return {"type": [type_, "null"]}
+
+
+# Strict structured-output schema mirroring EnrichLeadResponse. Strict mode
+# needs every property listed in "required" and additionalProperties false,
+# so optional fields are expressed as nullable types; score's 0-100 bound is
+# still enforced by the Pydantic validation below.
+ENRICH_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "enrich_lead",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "qualified": {"type": "boolean"},
+                "score": {"type": "integer"},
+                "reasons": {"type": "array", "items": {"type": "string"}},
+                "lead": {
+                    "type": "object",
+                    "properties": {
+                        "name": _nullable("string"),
+                        "email": _nullable("string"),
+                        "phone": _nullable("string"),
+                        "budget": _nullable("number"),
+                        "intent": _nullable("string"),
+                        "urgency": {
+                            "type": ["string", "null"],
+                            "enum": ["low", "medium", "high", None],
+                        },
+                        "industry": _nullable("string"),
+                    },
+                    "required": [
+                        "name", "email", "phone", "budget", "intent", "urgency", "industry",
+                    ],
+                    "additionalProperties": False,
+                },
+            },
+            "required": ["qualified", "score", "reasons", "lead"],
+            "additionalProperties": False,
+        },
+    },
+}
 
 
 async def enrich_lead_with_llm(payload: dict) -> EnrichLeadResponse:
@@ -49,33 +107,65 @@ async def enrich_lead_with_llm(payload: dict) -> EnrichLeadResponse:
     Call LLM to classify and extract structured lead data.
     Returns a strict EnrichLeadResponse — raises on schema mismatch.
     """
-    client = _build_client()
-    user_content = json.dumps(payload, default=str)
+    client = get_openai_client()
+    user_content = dumps_json(payload, default=str).decode()
+
+    kwargs: dict = {}
+    if settings.openai_structured_outputs:
+        kwargs["response_format"] = ENRICH_RESPONSE_FORMAT
 
     response = await client.chat.completions.create(
         model=settings.openai_model,
         messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
+            SYSTEM_MESSAGE,
             {"role": "user", "content": user_content},
         ],
-        temperature=0.1,
+        temperature=LLM_TEMPERATURE,
+        **kwargs,
     )
 
-    content = response.choices[0].message.content
+    message = response.choices[0].message
+    if message.refusal:
+        raise ValueError(f"LLM refused: {message.refusal}")
+    content = message.content
     if not content:
         raise ValueError("LLM returned empty response")
 
-    content = _strip_markdown_json(content)
-    data = json.loads(content)
+    if not settings.openai_structured_outputs:
+        # Prompt-only JSON may arrive wrapped in a markdown fence
+        content = _strip_markdown_json(content)
+
+    # Strict Pydantic validation (parsed straight from the JSON string) —
+    # raises ValidationError on mismatch
+    return _VALIDATE_JSON(content)
+
+
+async def enrich_lead_cached(payload: dict) -> tuple[EnrichLeadResponse, bool]:
+    """
+    enrich_lead_with_llm behind the LLM response cache.
+    Returns (result, cache_hit).
+    """
+    if llm_cache is None or LLM_TEMPERATURE > CACHEABLE_MAX_TEMPERATURE:
+        return await enrich_lead_with_llm(payload), False
+
+    key = llm_cache_key(settings.openai_model, SYSTEM_PROMPT, payload)
+    cached = await llm_cache.get(key)
+    if cached is not None:
+        return _VALIDATE_JSON(cached), True
 
-    # Strict Pydantic validation — raises ValidationError on mismatch
-    return EnrichLeadResponse.model_validate(data)
+    result = await enrich_lead_with_llm(payload)
+    await llm_cache.set(key, result.model_dump_json(), ttl=settings.llm_cache_ttl_seconds)
+    return result, False
 
 
 def _strip_markdown_json(text: str) -> str:
     """Remove ```json ... ``` wrapper if present."""
     text = text.strip()
     if text.startswith("```"):
-        text = re.sub(r"^```(?:json)?\s*", "", text)
-        text = re.sub(r"\s*```$", "", text)
+        text = text[3:]
+        if text[:4].lower() == "json":
+            text = text[4:]
+        text = text.lstrip()
+        if text.endswith("```"):
+            text = text[:-3].rstrip()
     return text
\ No newline at end of file
@@ -5,12 +5,10 @@ Takes lead + latest run result and returns summary, talking points, checklist.
 """
 
 import json
-import re
-
-from openai import AsyncOpenAI
 
 from api.config import settings
 from api.schemas.brief import LeadBriefResponse
+from api.services.openai_client import get_openai_client
 
 
 SYSTEM_PROMPT = """You are a sales enablement assistant. Given a lead and their qualification result, produce a brief for an upcoming call.
@@ -27,18 +25,15 @@ Output ONLY valid JSON matching this exact schema (no markdown, no extra text):
 - checklist: 3-5 items the rep should prepare (e.g. "technical architecture", "pricing sheet", "timeline")."""
 
 
-def _build_client() -> AsyncOpenAI:
-    kwargs: dict = {"api_key": settings.openai_api_key}
-    if settings.openai_base_url:
-        kwargs["base_url"] = settings.openai_base_url
-    return AsyncOpenAI(**kwargs)
-
-
 def _strip_markdown_json(text: str) -> str:
     text = text.strip()
     if text.startswith("```"):
-        text = re.sub(r"^```(?:json)?\s*", "", text)
-        text = re.sub(r"\s*```$", "", text)
+        text = text[3:]
+        if text[:4].lower() == "json":
+            text = text[4:]
+        text = text.lstrip()
+        if text.endswith("```"):
+            text = text[:-3].rstrip()
     return text
 
 
@@ -49,7 +44,7 @@ async def generate_lead_brief(
     """
     Generate a meeting prep brief from lead data and optional AI result.
     """
-    client = _build_client()
+    client = get_openai_client()
     user_parts = [f"Lead: {json.dumps(lead_data, default=str)}"]
     if result_json:
         user_parts.append(f"Qualification result: {json.dumps(result_json, default=str)}")
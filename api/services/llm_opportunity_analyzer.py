@@ -5,12 +5,11 @@ Structured output; retry on transient failures (up to 3 times).
 
 import json
 import logging
-import re
 
-from openai import AsyncOpenAI
 from pydantic import BaseModel, Field
 
 from api.config import settings
+from api.services.openai_client import get_openai_client
 
 logger = logging.getLogger(__name__)
 
@@ -39,18 +38,15 @@ SYSTEM_PROMPT = """You are an opportunity analyst. Given a grant or funding oppo
 Be concise. Use industry_match and key_requirements as arrays of strings."""
 
 
-def _build_client() -> AsyncOpenAI:
-    kwargs: dict = {"api_key": settings.openai_api_key}
-    if settings.openai_base_url:
-        kwargs["base_url"] = settings.openai_base_url
-    return AsyncOpenAI(**kwargs)
-
-
 def _strip_markdown_json(text: str) -> str:
     text = text.strip()
     if text.startswith("```"):
-        text = re.sub(r"^```(?:json)?\s*", "", text)
-        text = re.sub(r"\s*```$", "", text)
+        text = text[3:]
+        if text[:4].lower() == "json":
+            text = text[4:]
+        text = text.lstrip()
+        if text.endswith("```"):
+            text = text[:-3].rstrip()
     return text
 
 
@@ -82,7 +78,7 @@ async def analyze_opportunity_with_llm(
         parts.append(f"Location: {location}")
     user_content = "\n\n".join(parts)
 
-    client = _build_client()
+    client = get_openai_client()
     response = await client.chat.completions.create(
         model=settings.openai_model,
         messages=[
@@ -5,12 +5,11 @@ Generate on demand; retry once on transient failure.
 
 import json
 import logging
-import re
 
-from openai import AsyncOpenAI
 from pydantic import BaseModel, Field, field_validator
 
 from api.config import settings
+from api.services.openai_client import get_openai_client
 
 logger = logging.getLogger(__name__)
 
@@ -53,18 +52,15 @@ SYSTEM_PROMPT = """You are a proposal writer. Given a funding/grant opportunity
 Be concise. proposal_outline must be a string. checklist is an array of required materials or action items."""
 
 
-def _build_client() -> AsyncOpenAI:
-    kwargs: dict = {"api_key": settings.openai_api_key}
-    if settings.openai_base_url:
-        kwargs["base_url"] = settings.openai_base_url
-    return AsyncOpenAI(**kwargs)
-
-
 def _strip_markdown_json(text: str) -> str:
     text = text.strip()
     if text.startswith("```"):
-        text = re.sub(r"^```(?:json)?\s*", "", text)
-        text = re.sub(r"\s*```$", "", text)
+        text = text[3:]
+        if text[:4].lower() == "json":
+            text = text[4:]
+        text = text.lstrip()
+        if text.endswith("```"):
+            text = text[:-3].rstrip()
     return text
 
 
@@ -97,7 +93,7 @@ async def generate_proposal_brief_llm(
         parts.append(f"  Success probability: {ai_analysis.get('success_probability')}")
     user_content = "\n".join(parts)
 
-    client = _build_client()
+    client = get_openai_client()
     response = await client.chat.completions.create(
         model=settings.openai_model,
         messages=[
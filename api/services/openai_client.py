@@ -0,0 +1,38 @@
+"""
+Shared AsyncOpenAI client.
+
+One client (and one httpx connection pool) per process, so LLM calls reuse
+keep-alive connections instead of paying a TCP+TLS handshake each time.
+"""
+
+import httpx
+from openai import AsyncOpenAI
+
+from api.config import settings
+
+_client: AsyncOpenAI | None = None
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Return the process-wide AsyncOpenAI client, creating it on first use."""
+    global _client
+    if _client is None:
+        kwargs: dict = {
+            "api_key": settings.openai_api_key,
+            "http_client": httpx.AsyncClient(
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+                timeout=settings.openai_timeout_seconds,
+            ),
+        }
+        if settings.openai_base_url:
+            kwargs["base_url"] = settings.openai_base_url
+        _client = AsyncOpenAI(**kwargs)
+    return _client
+
+
+async def close_openai_client() -> None:
+    """Close the shared client and its connection pool (app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
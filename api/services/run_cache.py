@@ -0,0 +1,60 @@
+"""
+Short-lived per-process cache for GET /runs/{id}.
+
+Holds the encoded response body and its weak ETag per finished run, so
+repeated polls skip the DB round-trip and serialization. Entries are dropped
+when this process updates or deletes the run; other workers may serve a
+stale copy for at most RUN_CACHE_TTL_SECONDS, which is why the cache is off
+(0) unless configured.
+"""
+
+import hashlib
+
+from api.config import settings
+from api.services.ttl_cache import MemoryCache
+
+# run id -> (etag, body)
+_cache = MemoryCache[tuple[str, bytes]](maxsize=10_000)
+
+# Bumped by every invalidation. A body built from a read that began before
+# the latest bump may predate that write, so it is not stored.
+_generation = 0
+
+# Runs in these states are not expected to change again (pending ones are)
+CACHEABLE_STATUSES = frozenset({"success", "failed"})
+
+
+def make_etag(body: bytes) -> str:
+    """Weak validator over the response body."""
+    return f'W/"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+
+async def get_cached_run(run_id: str) -> tuple[str, bytes] | None:
+    """Return (etag, body) for a cached run response, if fresh."""
+    if settings.run_cache_ttl_seconds <= 0:
+        return None
+    return await _cache.get(run_id.lower())
+
+
+def cache_generation() -> int:
+    """Take before reading a run; pass to cache_run with the result."""
+    return _generation
+
+
+async def cache_run(run_id: str, body: bytes, status: str, generation: int) -> str:
+    """Cache an encoded run response unless it may be outdated; returns its ETag."""
+    etag = make_etag(body)
+    if (
+        settings.run_cache_ttl_seconds > 0
+        and status in CACHEABLE_STATUSES
+        and generation == _generation
+    ):
+        await _cache.set(run_id.lower(), (etag, body), ttl=settings.run_cache_ttl_seconds)
+    return etag
+
+
+async def invalidate_run(run_id: str) -> None:
+    """Drop a run after it changes."""
+    global _generation
+    _generation += 1
+    await _cache.delete(run_id.lower())
@@ -0,0 +1,39 @@
+"""In-process TTL LRU cache, shared by the LLM response cache and the run cache."""
+
+import time
+from collections import OrderedDict
+from typing import Generic, TypeVar
+
+V = TypeVar("V")
+
+
+class MemoryCache(Generic[V]):
+    """
+    In-process TTL LRU. Each method runs without awaiting, so on a single
+    event loop no lock is needed.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        # key -> (expires_at monotonic, value); most recently used last
+        self._store: OrderedDict[str, tuple[float, V]] = OrderedDict()
+
+    async def get(self, key: str) -> V | None:
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._store[key]
+            return None
+        self._store.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: V, ttl: int) -> None:
+        self._store[key] = (time.monotonic() + ttl, value)
+        self._store.move_to_end(key)
+        while len(self._store) > self.maxsize:
+            self._store.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._store.pop(key, None)
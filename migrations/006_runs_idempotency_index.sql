@@ -0,0 +1,10 @@
+-- Partial index for the idempotency lookup (latest successful run per key).
+-- Safe to run multiple times.
+
+CREATE INDEX IF NOT EXISTS idx_runs_idempotency_success
+  ON runs(idempotency_key, created_at DESC)
+  WHERE status = 'success';
+
+-- Superseded by idx_runs_idempotency_success
+DROP INDEX IF EXISTS idx_runs_idempotency_key;
+DROP INDEX IF EXISTS ix_runs_idempotency_key;
@@ -0,0 +1,14 @@
+-- Indexable run filters: generated runs.qualified + composite list indexes.
+-- Safe to run multiple times.
+
+ALTER TABLE runs
+  ADD COLUMN IF NOT EXISTS qualified BOOLEAN GENERATED ALWAYS AS (
+    CASE WHEN jsonb_typeof(result_json -> 'qualified') = 'boolean'
+         THEN (result_json -> 'qualified')::boolean END
+  ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_runs_qualified_created ON runs(qualified, created_at);
+CREATE INDEX IF NOT EXISTS idx_runs_status_created ON runs(status, created_at);
+
+-- Superseded by idx_runs_status_created
+DROP INDEX IF EXISTS idx_runs_status;
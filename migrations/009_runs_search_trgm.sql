@@ -0,0 +1,8 @@
+-- Trigram GIN indexes for GET /runs substring search (source, error, id).
+-- Safe to run multiple times.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_runs_source_trgm ON runs USING gin (source gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_runs_error_trgm ON runs USING gin (error gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_runs_id_trgm ON runs USING gin ((id::text) gin_trgm_ops);
@@ -0,0 +1,8 @@
+-- Composite index matching the GET /runs sort (created_at DESC, id DESC):
+-- serves unfiltered pages, the keyset cursor and the metrics "today" count.
+-- Safe to run multiple times.
+
+CREATE INDEX IF NOT EXISTS idx_runs_created_id ON runs(created_at DESC, id DESC);
+
+-- Superseded by idx_runs_created_id
+DROP INDEX IF EXISTS idx_runs_created_at;
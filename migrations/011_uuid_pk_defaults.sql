@@ -0,0 +1,10 @@
+-- Server-side UUID defaults for the remaining primary keys. Tables created
+-- by SQLAlchemy create_all (AUTO_CREATE_SCHEMA / older startups) have no
+-- column default because ids used to be generated in Python.
+-- Safe to run multiple times.
+
+ALTER TABLE IF EXISTS leads ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE IF EXISTS opportunities ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE IF EXISTS ai_analysis ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE IF EXISTS opportunity_scores ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE IF EXISTS crm_records ALTER COLUMN id SET DEFAULT gen_random_uuid();
@@ -109,6 +109,57 @@ async def migrate():
     print("  ✓ Column 'runs.lead_id' ensured.")
     await conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_lead_id ON runs(lead_id);")
 
+    # Idempotency lookup: latest successful run per key (006)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_runs_idempotency_success
+        ON runs(idempotency_key, created_at DESC)
+        WHERE status = 'success';
+    """)
+    await conn.execute("DROP INDEX IF EXISTS idx_runs_idempotency_key;")
+    await conn.execute("DROP INDEX IF EXISTS ix_runs_idempotency_key;")
+    print("  ✓ Index 'idx_runs_idempotency_success' ensured.")
+
+    # Time-ordered UUIDv7 ids for runs (007)
+    await conn.execute("""
+        CREATE OR REPLACE FUNCTION gen_uuid_v7() RETURNS uuid AS $$
+        DECLARE
+            ts_ms bytea := substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3);
+            uuid_bytes bytea := uuid_send(gen_random_uuid());
+        BEGIN
+            uuid_bytes := overlay(uuid_bytes PLACING ts_ms FROM 1 FOR 6);
+            uuid_bytes := set_byte(uuid_bytes, 6, (b'0111' || get_byte(uuid_bytes, 6)::bit(4))::bit(8)::int);
+            RETURN encode(uuid_bytes, 'hex')::uuid;
+        END
+        $$ LANGUAGE plpgsql VOLATILE;
+    """)
+    await conn.execute("ALTER TABLE runs ALTER COLUMN id SET DEFAULT gen_uuid_v7();")
+    print("  ✓ Default 'runs.id = gen_uuid_v7()' ensured.")
+
+    # Generated runs.qualified + composite list indexes (008)
+    await conn.execute("""
+        ALTER TABLE runs
+        ADD COLUMN IF NOT EXISTS qualified BOOLEAN GENERATED ALWAYS AS (
+            CASE WHEN jsonb_typeof(result_json -> 'qualified') = 'boolean'
+                 THEN (result_json -> 'qualified')::boolean END
+        ) STORED;
+    """)
+    print("  ✓ Column 'runs.qualified' ensured.")
+    await conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_qualified_created ON runs(qualified, created_at);")
+    await conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_status_created ON runs(status, created_at);")
+    await conn.execute("DROP INDEX IF EXISTS idx_runs_status;")
+
+    # Trigram indexes for run search (009)
+    await conn.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    await conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_source_trgm ON runs USING gin (source gin_trgm_ops);")
+    await conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_error_trgm ON runs USING gin (error gin_trgm_ops);")
+    await conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_id_trgm ON runs USING gin ((id::text) gin_trgm_ops);")
+    print("  ✓ Trigram search indexes on runs ensured.")
+
+    # List-order index on runs (010)
+    await conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_created_id ON runs(created_at DESC, id DESC);")
+    await conn.execute("DROP INDEX IF EXISTS idx_runs_created_at;")
+    print("  ✓ Index 'idx_runs_created_id' ensured.")
+
     # ICP: leads.icp_score and company_profile table (005)
     await conn.execute("ALTER TABLE leads ADD COLUMN IF NOT EXISTS icp_score INTEGER;")
     print("  ✓ Column 'leads.icp_score' ensured.")
@@ -198,6 +249,11 @@ async def migrate():
     await conn.execute("CREATE INDEX IF NOT EXISTS idx_crm_records_opportunity_id ON crm_records(opportunity_id);")
     await conn.execute("CREATE INDEX IF NOT EXISTS idx_crm_records_stage ON crm_records(stage);")
 
+    # Server-side id defaults for tables created by create_all (011)
+    for table in ("leads", "opportunities", "ai_analysis", "opportunity_scores", "crm_records"):
+        await conn.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT gen_random_uuid();")
+    print("  ✓ Defaults 'id = gen_random_uuid()' ensured.")
+
     await conn.close()
     print("\nMigration complete. You can now restart your FastAPI server.")
 